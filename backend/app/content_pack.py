@@ -0,0 +1,250 @@
+"""
+Compiled, read-only story content pack.
+
+Levels, characters and dialogue are compiled from SQLite into a single
+immutable binary file which every worker process mmaps. Records are read
+straight out of the shared page cache, so adding workers does not add
+per-process copies of the story content.
+
+File layout (little-endian):
+
+    header      magic, format version, content version, section offsets/counts
+    levels      fixed-width level records, ordered by level_number
+    dialogues   fixed-width dialogue records, grouped by level and ordered by sequence
+    strings     UTF-8 string table; records reference it by (offset, length)
+"""
+
+import hashlib
+import mmap
+import os
+import sqlite3
+import struct
+
+MAGIC = b"SGCP"
+FORMAT_VERSION = 1
+
+# magic, format_version, reserved, content_version,
+# level_count, levels_offset, dialogue_count, dialogues_offset,
+# strings_offset, strings_length
+_HEADER = struct.Struct("<4sHH16sIIIIII")
+
+# id, level_number, title(off, len), description(off, len),
+# first_dialogue, dialogue_count
+_LEVEL = struct.Struct("<iiIIIIII")
+
+# id, sequence, speaker(off, len), text(off, len),
+# character_name(off, len), character_title(off, len), gives_key, padding
+_DIALOGUE = struct.Struct("<iiIIIIIIIIB3x")
+
+# String reference used for NULL columns
+_NULL_REF = (0xFFFFFFFF, 0)
+
+
+class _StringTable:
+    def __init__(self):
+        self._data = bytearray()
+        self._refs: dict[str, tuple[int, int]] = {}
+
+    def add(self, value: str | None) -> tuple[int, int]:
+        if value is None:
+            return _NULL_REF
+        ref = self._refs.get(value)
+        if ref is None:
+            encoded = value.encode("utf-8")
+            ref = (len(self._data), len(encoded))
+            self._data += encoded
+            self._refs[value] = ref
+        return ref
+
+    def to_bytes(self) -> bytes:
+        return bytes(self._data)
+
+
+def build_content_pack(conn: sqlite3.Connection, pack_path: str) -> dict:
+    """Compile levels and dialogue from SQLite into a pack file at pack_path."""
+    cur = conn.cursor()
+    cur.execute(
+        "SELECT id, level_number, title, description FROM levels ORDER BY level_number"
+    )
+    level_rows = cur.fetchall()
+
+    strings = _StringTable()
+    level_records = []
+    dialogue_records = []
+
+    for level_id, level_number, title, description in level_rows:
+        cur.execute(
+            """
+            SELECT d.id, d.sequence, d.speaker, d.text, d.gives_key,
+                   c.name, c.title
+            FROM dialogues d
+            JOIN characters c ON d.character_id = c.id
+            WHERE d.level_id = ?
+            ORDER BY d.sequence
+            """,
+            (level_id,),
+        )
+        dialogue_rows = cur.fetchall()
+
+        level_records.append(
+            _LEVEL.pack(
+                level_id,
+                level_number,
+                *strings.add(title),
+                *strings.add(description),
+                len(dialogue_records),
+                len(dialogue_rows),
+            )
+        )
+        for d_id, sequence, speaker, text, gives_key, name, char_title in dialogue_rows:
+            dialogue_records.append(
+                _DIALOGUE.pack(
+                    d_id,
+                    sequence,
+                    *strings.add(speaker),
+                    *strings.add(text),
+                    *strings.add(name),
+                    *strings.add(char_title),
+                    1 if gives_key else 0,
+                )
+            )
+
+    levels_blob = b"".join(level_records)
+    dialogues_blob = b"".join(dialogue_records)
+    strings_blob = strings.to_bytes()
+
+    levels_offset = _HEADER.size
+    dialogues_offset = levels_offset + len(levels_blob)
+    strings_offset = dialogues_offset + len(dialogues_blob)
+
+    # Content version changes whenever the compiled content does
+    content_version = hashlib.sha256(
+        levels_blob + dialogues_blob + strings_blob
+    ).digest()[:16]
+
+    header = _HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        0,
+        content_version,
+        len(level_records),
+        levels_offset,
+        len(dialogue_records),
+        dialogues_offset,
+        strings_offset,
+        len(strings_blob),
+    )
+
+    # Write to a temp file and swap it in, so workers that already mapped the
+    # previous pack keep reading a consistent file.
+    tmp_path = f"{pack_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(levels_blob)
+        f.write(dialogues_blob)
+        f.write(strings_blob)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, pack_path)
+
+    return {
+        "version": content_version.hex(),
+        "levels": len(level_records),
+        "dialogues": len(dialogue_records),
+        "string_bytes": len(strings_blob),
+    }
+
+
+class ContentPack:
+    """Read-only view over an mmapped content pack."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mm) < _HEADER.size:
+            self._mm.close()
+            raise ValueError(f"Content pack {path} is truncated")
+
+        (
+            magic,
+            format_version,
+            _reserved,
+            content_version,
+            self._level_count,
+            self._levels_offset,
+            self._dialogue_count,
+            self._dialogues_offset,
+            self._strings_offset,
+            strings_length,
+        ) = _HEADER.unpack_from(self._mm, 0)
+
+        if magic != MAGIC or format_version != FORMAT_VERSION:
+            self._mm.close()
+            raise ValueError(f"Content pack {path} has an unsupported format")
+        if self._strings_offset + strings_length > len(self._mm):
+            self._mm.close()
+            raise ValueError(f"Content pack {path} is truncated")
+
+        self.version = content_version.hex()
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def _string(self, offset: int, length: int) -> str | None:
+        if (offset, length) == _NULL_REF:
+            return None
+        start = self._strings_offset + offset
+        return str(self._mm[start:start + length], "utf-8")
+
+    def _level_record(self, index: int) -> tuple:
+        return _LEVEL.unpack_from(self._mm, self._levels_offset + index * _LEVEL.size)
+
+    def levels(self) -> list[dict]:
+        """Return all levels ordered by level_number."""
+        levels = []
+        for i in range(self._level_count):
+            level_id, level_number, t_off, t_len, d_off, d_len, _, _ = self._level_record(i)
+            levels.append(
+                {
+                    "id": level_id,
+                    "level_number": level_number,
+                    "title": self._string(t_off, t_len),
+                    "description": self._string(d_off, d_len),
+                }
+            )
+        return levels
+
+    def dialogue(self, level_id: int) -> list[dict]:
+        """Return ordered dialogue lines for a level (empty if unknown)."""
+        for i in range(self._level_count):
+            record = self._level_record(i)
+            if record[0] == level_id:
+                first, count = record[6], record[7]
+                break
+        else:
+            return []
+
+        lines = []
+        for j in range(first, first + count):
+            (
+                d_id,
+                sequence,
+                s_off, s_len,
+                x_off, x_len,
+                n_off, n_len,
+                c_off, c_len,
+                gives_key,
+            ) = _DIALOGUE.unpack_from(self._mm, self._dialogues_offset + j * _DIALOGUE.size)
+            lines.append(
+                {
+                    "id": d_id,
+                    "sequence": sequence,
+                    "speaker": self._string(s_off, s_len),
+                    "text": self._string(x_off, x_len),
+                    "gives_key": bool(gives_key),
+                    "character_name": self._string(n_off, n_len),
+                    "character_title": self._string(c_off, c_len),
+                }
+            )
+        return lines
@@ -0,0 +1,218 @@
+"""
+Background health prober for SQLite and MongoDB.
+
+A daemon thread checks each dependency on an interval and publishes an
+immutable snapshot. The /healthz and /readyz endpoints only read that
+snapshot, so orchestrator probes never wait on a slow dependency.
+
+MongoDB calls go through a circuit breaker: after repeated failures it opens
+and Mongo-dependent features fail fast until a trial ping succeeds again.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable
+
+from pymongo import MongoClient
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker (closed -> open -> half-open)."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self) -> bool:
+        """Return False while open; callers should fail fast instead of calling out.
+
+        When half-open only one trial call is admitted; everyone else keeps
+        failing fast until it records its outcome.
+        """
+        with self._lock:
+            state = self._state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state() == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+class HealthProber:
+    """Periodically probes dependencies and caches the latest results."""
+
+    def __init__(
+        self,
+        database_path: str,
+        mongo_client: Callable[[], MongoClient] | None,
+        mongo_breaker: CircuitBreaker,
+        interval: float = 5.0,
+        integrity_interval: float = 300.0,
+        write_lock_misses: int = 3,
+    ):
+        self.database_path = database_path
+        self.mongo_client = mongo_client
+        self.mongo_breaker = mongo_breaker
+        self.interval = interval
+        self.integrity_interval = integrity_interval
+        self.write_lock_misses = write_lock_misses
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        # Monotonic time of the last finished round; only used for staleness
+        self._last_round: float | None = None
+        # quick_check scans the whole database, so its result is reused between runs
+        self._integrity: str | None = None
+        self._integrity_checked: float | None = None
+        self._consecutive_lock_misses = 0
+        # Replaced wholesale after each round; readers never see a partial update
+        self.snapshot: dict = {"checked_at": None, "sqlite": None, "mongo": None}
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="health-prober", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.probe_once()
+            except Exception as e:
+                # Keep probing; a failed round shows up as not-ready instead of a dead thread
+                print(f"Health probe round failed: {e}")
+                self.snapshot = {
+                    "checked_at": time.time(),
+                    "sqlite": None,
+                    "mongo": None,
+                    "error": str(e),
+                }
+            self._last_round = time.monotonic()
+            self._stop.wait(self.interval)
+
+    def probe_once(self) -> dict:
+        self.snapshot = {
+            "checked_at": time.time(),
+            "sqlite": self._probe_sqlite(),
+            "mongo": self._probe_mongo(),
+        }
+        return self.snapshot
+
+    def is_stale(self) -> bool:
+        """True if the prober has not completed a round within a few intervals."""
+        last_round = self._last_round
+        if last_round is None:
+            return False
+        # Allow for a full Mongo server selection timeout on top of the interval
+        return time.monotonic() - last_round > self.interval * 3 + 5
+
+    def _wal_bytes(self) -> int:
+        # The WAL file can be checkpointed away at any moment
+        try:
+            return os.path.getsize(f"{self.database_path}-wal")
+        except OSError:
+            return 0
+
+    def _probe_sqlite(self) -> dict:
+        started = time.perf_counter()
+        result = {
+            "ok": False,
+            "integrity": self._integrity,
+            "write_lock": False,
+            "wal_bytes": self._wal_bytes(),
+        }
+        try:
+            conn = sqlite3.connect(self.database_path, timeout=0.5, isolation_level=None)
+            try:
+                cur = conn.cursor()
+                now = time.monotonic()
+                if (
+                    self._integrity_checked is None
+                    or now - self._integrity_checked >= self.integrity_interval
+                ):
+                    self._integrity = cur.execute("PRAGMA quick_check(1)").fetchone()[0]
+                    self._integrity_checked = now
+                    result["integrity"] = self._integrity
+                # Take and release the write lock without changing anything
+                try:
+                    cur.execute("BEGIN IMMEDIATE")
+                    cur.execute("ROLLBACK")
+                    result["write_lock"] = True
+                    self._consecutive_lock_misses = 0
+                except sqlite3.OperationalError as e:
+                    self._consecutive_lock_misses += 1
+                    result["error"] = str(e)
+            finally:
+                conn.close()
+            # A busy writer is normal; only repeated misses mean the lock is stuck
+            result["write_lock_misses"] = self._consecutive_lock_misses
+            result["ok"] = (
+                result["integrity"] == "ok"
+                and self._consecutive_lock_misses < self.write_lock_misses
+            )
+        except Exception as e:
+            result["error"] = str(e)
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return result
+
+    def _probe_mongo(self) -> dict:
+        if self.mongo_client is None:
+            return {"ok": None, "configured": False, "breaker": self.mongo_breaker.state}
+        result = {"ok": False, "configured": True}
+        if not self.mongo_breaker.allow():
+            result["error"] = "circuit open"
+            result["breaker"] = self.mongo_breaker.state
+            return result
+
+        started = time.perf_counter()
+        try:
+            self.mongo_client().admin.command("ping")
+            self.mongo_breaker.record_success()
+            result["ok"] = True
+        except Exception as e:
+            self.mongo_breaker.record_failure()
+            result["error"] = str(e)
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        result["breaker"] = self.mongo_breaker.state
+        return result
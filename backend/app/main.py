@@ -1,16 +1,27 @@
 import os
 import sqlite3
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
 from fastapi.middleware.cors import CORSMiddleware
 from pymongo import MongoClient
 
+from app.content_pack import ContentPack
+from app.health import CircuitBreaker, HealthProber
+
 load_dotenv()
 
 # SQLite database path
 DATABASE_PATH = os.getenv("DATABASE_URL", "storygame.db")
 
+# Compiled story content (built by build_content_pack.py); falls back to SQLite when absent
+CONTENT_PACK_PATH = os.getenv(
+    "CONTENT_PACK_PATH",
+    os.path.join(os.path.dirname(DATABASE_PATH), "storygame.pack"),
+)
+
 # MongoDB connection (optional; used for local dev + future features)
 MONGODB_URI = os.getenv("MONGODB_URI", "").strip()
 
@@ -28,7 +39,28 @@ def get_mongo_client() -> MongoClient:
         )
     return _mongo_client
 
-app = FastAPI()
+
+# Background dependency checks; /healthz and /readyz only read the cached results
+mongo_breaker = CircuitBreaker(
+    failure_threshold=int(os.getenv("MONGO_BREAKER_FAILURES", "3")),
+    reset_timeout=float(os.getenv("MONGO_BREAKER_RESET_SECONDS", "30")),
+)
+health_prober = HealthProber(
+    DATABASE_PATH,
+    get_mongo_client if MONGODB_URI else None,
+    mongo_breaker,
+    interval=float(os.getenv("HEALTH_PROBE_INTERVAL", "5")),
+    integrity_interval=float(os.getenv("HEALTH_INTEGRITY_INTERVAL", "300")),
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    health_prober.start()
+    yield
+    health_prober.stop()
+
+app = FastAPI(lifespan=lifespan)
 
 # Allow the frontend to call the API (localhost for dev + any origin for production)
 app.add_middleware(
@@ -63,6 +95,17 @@ def init_db():
 init_db()
 
 
+def load_content_pack() -> ContentPack | None:
+    """Map the compiled content pack if one has been built."""
+    try:
+        return ContentPack(CONTENT_PACK_PATH)
+    except (OSError, ValueError) as e:
+        print(f"Content pack unavailable, serving content from SQLite: {e}")
+        return None
+
+_content_pack = load_content_pack()
+
+
 class RegisterRequest(BaseModel):
     email: str
     username: str
@@ -112,15 +155,39 @@ def read_root():
     return {"message": "Welcome to the User Management API"}
 
 
+@app.get("/healthz")
+async def healthz():
+    """Liveness probe: the process is serving and the background prober is running."""
+    if health_prober.is_stale():
+        return JSONResponse(status_code=503, content={"status": "stale"})
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+async def readyz():
+    """Readiness probe from cached dependency checks. MongoDB is optional, so only SQLite gates readiness."""
+    snapshot = health_prober.snapshot
+    sqlite_status = snapshot["sqlite"]
+    ready = bool(sqlite_status and sqlite_status["ok"]) and not health_prober.is_stale()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"ready": ready, **snapshot},
+    )
+
+
 @app.get("/debug/mongo")
 def debug_mongo():
     """Simple connectivity check for MongoDB from inside the backend container."""
     client = get_mongo_client()
+    if not mongo_breaker.allow():
+        raise HTTPException(status_code=503, detail="MongoDB unavailable (circuit open)")
     try:
         result = client.admin.command("ping")
+        mongo_breaker.record_success()
         ok = bool(result.get("ok"))
         return {"ok": ok, "result": result}
     except Exception as e:
+        mongo_breaker.record_failure()
         raise HTTPException(status_code=500, detail=f"Mongo ping failed: {e}")
 
 @app.post("/register")
@@ -163,6 +230,8 @@ def login(req: LoginRequest):
 @app.get("/levels", response_model=list[LevelResponse])
 def get_levels():
     """Return all levels in order. Used by the game UI/book."""
+    if _content_pack is not None:
+        return [LevelResponse(**level) for level in _content_pack.levels()]
     try:
         with get_conn() as conn:
             cur = conn.cursor()
@@ -293,6 +362,11 @@ def submit_level_key(level_id: int, req: SubmitKeyRequest):
 @app.get("/levels/{level_id}/dialogue", response_model=list[DialogueLine])
 def get_level_dialogue(level_id: int):
     """Return ordered dialogue lines for a given level."""
+    if _content_pack is not None:
+        lines = _content_pack.dialogue(level_id)
+        if not lines:
+            raise HTTPException(status_code=404, detail="No dialogue for this level")
+        return [DialogueLine(**line) for line in lines]
     try:
         with get_conn() as conn:
             cur = conn.cursor()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Content pack build script
+Run this after init_db.py to compile levels, characters and dialogue
+into the read-only pack file served by the API workers
+"""
+
+import sqlite3
+import os
+from dotenv import load_dotenv
+
+from app.content_pack import build_content_pack
+
+load_dotenv()
+
+DATABASE_PATH = os.getenv("DATABASE_URL", "storygame.db")
+CONTENT_PACK_PATH = os.getenv(
+    "CONTENT_PACK_PATH",
+    os.path.join(os.path.dirname(DATABASE_PATH), "storygame.pack"),
+)
+
+
+def build():
+    print(f"Compiling content from {DATABASE_PATH} into {CONTENT_PACK_PATH}")
+
+    conn = sqlite3.connect(DATABASE_PATH)
+    try:
+        stats = build_content_pack(conn, CONTENT_PACK_PATH)
+    finally:
+        conn.close()
+
+    print(
+        f"Packed {stats['levels']} levels, {stats['dialogues']} dialogue lines, "
+        f"{stats['string_bytes']} string bytes (version {stats['version']})"
+    )
+    print("Content pack build complete!")
+
+if __name__ == "__main__":
+    build()